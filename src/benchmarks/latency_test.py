@@ -3,23 +3,146 @@
 Latency test for MI350X-optimized fractal encoder with quantum-ready features
 """
 
+import ctypes
 import time
 import numpy as np
-from typing import List, Tuple, Dict
+from typing import Tuple, Dict
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from numba import njit, prange, threading_layer
+except ImportError:
+    njit = None
+
+try:
+    import cupy
+except ImportError:
+    cupy = None
+
+def _load_sobel_ext():
+    """Load the optional native edge-detection kernels built by the Makefile"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'libsobel.so')
+    try:
+        lib = ctypes.CDLL(path)
+    except OSError:
+        return None
+    
+    u8_2d = np.ctypeslib.ndpointer(dtype=np.uint8, ndim=2, flags='C_CONTIGUOUS')
+    lib.sobel_u8_4k.argtypes = [u8_2d, u8_2d] + [ctypes.c_int] * 6
+    lib.sobel_u8_4k.restype = ctypes.c_int
+    lib.sobel_isa.argtypes = []
+    lib.sobel_isa.restype = ctypes.c_char_p
+    return lib
+
+_SOBEL_EXT = _load_sobel_ext()
+
+# Edge kernel for CuPy (CUDA, or HIP on ROCm builds). Each 16x16 block
+# stages an 18x18 tile in shared memory so source pixels are read once.
+_GPU_EDGE_SRC = r'''
+extern "C" __global__
+void edges_u8(const unsigned char *src, unsigned char *dst, int w, int h,
+              int thr2, int quantum, int qgx, int qgy)
+{
+    __shared__ unsigned char tile[18][18];
+    const int tx = threadIdx.x, ty = threadIdx.y;
+    const int bx = blockIdx.x * 16, by = blockIdx.y * 16;
+
+    for (int i = ty * 16 + tx; i < 18 * 18; i += 16 * 16) {
+        const int sx = bx + i % 18 - 1, sy = by + i / 18 - 1;
+        tile[i / 18][i % 18] = (sx >= 0 && sx < w && sy >= 0 && sy < h) ? src[sy * w + sx] : 0;
+    }
+    __syncthreads();
+
+    const int x = bx + tx, y = by + ty;
+    if (x >= w || y >= h)
+        return;
+    unsigned char edge = 0;
+    if (x > 0 && y > 0 && x < w - 1 && y < h - 1) {
+        int gx = tile[ty + 2][tx + 2] - tile[ty][tx];
+        int gy = tile[ty + 2][tx] - tile[ty][tx + 2];
+        if (quantum) {
+            gx = (gx & 0xFF) ^ qgx;
+            gy = (gy & 0xFF) ^ qgy;
+        }
+        edge = gx * gx + gy * gy > thr2 ? 255 : 0;
+    }
+    dst[y * w + x] = edge;
+}
+'''
+
+def _load_gpu_edge_kernel():
+    """Build the CuPy edge kernel when CuPy and a GPU are available
+    
+    The kernel is compiled here (RawKernel compiles lazily), so an
+    NVRTC/hiprtc failure disables the GPU backend instead of surfacing in
+    the first encoder.
+    """
+    if cupy is None:
+        return None
+    try:
+        if cupy.cuda.runtime.getDeviceCount() == 0:
+            return None
+        kernel = cupy.RawKernel(_GPU_EDGE_SRC, 'edges_u8')
+        kernel.compile()
+    except (RuntimeError, cupy.cuda.compiler.CompileException):
+        return None
+    return kernel
+
+_GPU_EDGE_KERNEL = _load_gpu_edge_kernel()
+
+# Gradient magnitude an edge must exceed (raised by the quantum state in
+# quantum mode); every backend compares squared integer magnitudes
+EDGE_THRESHOLD = 30
+
+# Bytes of int32 gradient scratch (gx + gy) per edge-detection strip,
+# sized to keep a strip resident in a typical 2 MiB L2
+EDGE_STRIP_BYTES = 1 << 20
+
+# Affine transformation parameters (a, b, c, d, e, f)
+AFFINE_PARAMS = (0.85, 0.04, -0.04, 0.85, 0.0, 1.6)
+
+# MI350X encoder backends, selected through the backend argument or
+# MI350X_BACKEND
+BACKENDS = ('gpu', 'numba', 'native', 'numpy')
+
+# Backends tried in order when none is requested; the GPU path has not yet
+# been validated on a device, so it is opt-in
+AUTO_BACKENDS = ('numba', 'native', 'numpy')
+
+def _backend_available(backend: str) -> bool:
+    """Whether the optional dependency behind an encoder backend is present"""
+    return {
+        'gpu': _GPU_EDGE_KERNEL is not None,
+        'numba': njit is not None,
+        'native': _SOBEL_EXT is not None,
+        'numpy': True
+    }[backend]
+
+def _select_backend(backend: str = None) -> str:
+    """Resolve a requested encoder backend, or pick the first available one"""
+    backend = backend or os.environ.get('MI350X_BACKEND') or 'auto'
+    if backend == 'auto':
+        return next(b for b in AUTO_BACKENDS if _backend_available(b))
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown MI350X backend {backend!r}, expected one of {BACKENDS}")
+    if not _backend_available(backend):
+        raise ValueError(f"MI350X backend {backend!r} is not available on this host")
+    return backend
 
 # Mock ROCm HIP API for testing
 class HIPStream:
     def __init__(self):
-        self.events = []
+        # Monotonic timestamp (ns) of the last recorded event, 0 if none
+        self._t0 = 0
     
     def record(self):
-        self.events.append(time.time())
+        self._t0 = time.perf_counter_ns()
     
     def synchronize(self):
-        if self.events:
-            return time.time() - self.events[-1]
+        if self._t0:
+            return (time.perf_counter_ns() - self._t0) * 1e-9
         return 0.0
 
 class HIPDevice:
@@ -29,13 +152,88 @@ class HIPDevice:
     def synchronize(self):
         return self.stream.synchronize()
 
+def _make_encode_kernel(quantum_mode: bool, width: int, height: int):
+    """Build the fused edge/coordinate/transform kernel for one mode and size
+    
+    quantum_mode and the frame size are captured as compile-time constants,
+    so each kernel is specialised: no per-pixel mode branch and constant
+    loop bounds. Callers must pass frames of exactly height x width.
+    """
+    a, b, c, d, e, f = AFFINE_PARAMS
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _encode_kernel(frame, qbytes, out_coeffs):
+        thr = EDGE_THRESHOLD + qbytes[0] if quantum_mode else EDGE_THRESHOLD
+        thr2 = thr * thr
+        
+        # Edge detection and coordinate selection in one pass per row;
+        # only the first 4 survivors of each row are ever needed
+        row_xs = np.empty((height, 4), dtype=np.int64)
+        row_counts = np.zeros(height, dtype=np.int64)
+        for y in prange(1, height - 1):
+            n = 0
+            if quantum_mode:
+                # (x ^ y) == qbytes[3] admits exactly one pixel per row, at
+                # x = y ^ qbytes[3], so only that pixel is tested
+                x = y ^ qbytes[3]
+                if 1 <= x < width - 1:
+                    gx = np.int32(frame[y+1, x+1]) - np.int32(frame[y-1, x-1])
+                    gy = np.int32(frame[y+1, x-1]) - np.int32(frame[y-1, x+1])
+                    gx = (gx ^ qbytes[1]) & 0xFF
+                    gy = (gy ^ qbytes[2]) & 0xFF
+                    if gx * gx + gy * gy > thr2:
+                        row_xs[y, 0] = x
+                        n = 1
+            else:
+                for x in range(1, width - 1):
+                    gx = np.int32(frame[y+1, x+1]) - np.int32(frame[y-1, x-1])
+                    gy = np.int32(frame[y+1, x-1]) - np.int32(frame[y-1, x+1])
+                    if gx * gx + gy * gy > thr2:
+                        row_xs[y, n] = x
+                        n += 1
+                        if n == 4:
+                            break
+            row_counts[y] = n
+        
+        # Fractal transformation of the first 4 coordinates in row-major order
+        out_coeffs[:] = 0.0
+        bits = out_coeffs.view(np.int32)
+        i = 0
+        for y in range(height):
+            for j in range(row_counts[y]):
+                x = row_xs[y, j]
+                out_coeffs[i*2] = a * x + b * y + e
+                out_coeffs[i*2+1] = c * x + d * y + f
+                if quantum_mode:
+                    # Quantum influence is applied to the float32 bit pattern
+                    bits[i*2] ^= qbytes[4]
+                    bits[i*2+1] ^= qbytes[5]
+                i += 1
+                if i == 4:
+                    return
+    
+    return _encode_kernel
+
+_ENCODE_KERNELS = {}
+
+def _get_encode_kernel(quantum_mode: bool, width: int, height: int):
+    """Return the fused kernel for this configuration, or None without Numba"""
+    if njit is None:
+        return None
+    key = (bool(quantum_mode), width, height)
+    if key not in _ENCODE_KERNELS:
+        _ENCODE_KERNELS[key] = _make_encode_kernel(*key)
+    return _ENCODE_KERNELS[key]
+
 class MI350XEncoder:
     """MI350X-optimized fractal encoder with quantum-ready features"""
     
-    def __init__(self, width: int, height: int, quantum_mode: bool = False):
+    def __init__(self, width: int, height: int, quantum_mode: bool = False,
+                 backend: str = None):
         self.width = width
         self.height = height
         self.quantum_mode = quantum_mode
+        self.backend = _select_backend(backend)
         self.device = HIPDevice()
         self.stream = self.device.stream
         
@@ -43,34 +241,129 @@ class MI350XEncoder:
         self.hbm4_buffer = np.zeros((height, width), dtype=np.uint8)
         self.sram_buffer = np.zeros((64, 64), dtype=np.uint8)  # 64MB SRAM cache
         
-        # Quantum state tracking
+        # Interior rows are processed in cache-sized strips; the gradient
+        # scratch buffers hold one strip and are reused across frames
+        strip_rows = max(1, EDGE_STRIP_BYTES // (8 * max(width - 2, 1)))
+        self._strips = [(y0, min(y0 + strip_rows, height - 1))
+                        for y0 in range(1, height - 1, strip_rows)]
+        self._gx = np.empty((strip_rows, max(width - 2, 0)), dtype=np.int32)
+        self._gy = np.empty((strip_rows, max(width - 2, 0)), dtype=np.int32)
+        self._edge_mask = np.zeros((height, width), dtype=bool)
+        self._rows = np.arange(height)
+        self._native = self.backend == 'native'
+        if self._native:
+            self._edge_bytes = np.zeros((height, width), dtype=np.uint8)
+        
+        # Affine transformation as a row-vector matrix and translation, in
+        # float64 like the fused kernel's arithmetic so every backend rounds
+        # to the same float32 coefficients
+        a, b, c, d, e, f = AFFINE_PARAMS
+        self._A = np.array([[a, c], [b, d]], dtype=np.float64)
+        self._t = np.array([e, f], dtype=np.float64)
+        
+        # Device buffers when encoding on the GPU through CuPy
+        self._gpu = self.backend == 'gpu'
+        if self._gpu:
+            self._d_frame = cupy.empty((height, width), dtype=cupy.uint8)
+            self._d_edges = cupy.empty((height, width), dtype=cupy.uint8)
+            self._d_A = cupy.asarray(self._A)
+            self._d_t = cupy.asarray(self._t)
+        
+        # Quantum state tracking; the state stays in place and is rotated
+        # by moving the offset at which word 0 is read
         self.quantum_state = np.zeros(8, dtype=np.uint64)
+        self._qoff = 0
         if quantum_mode:
             self._initialize_quantum_state()
+        
+        # Edge detector specialised for this mode, selected once
+        if quantum_mode:
+            self._detect_edges = self._detect_edges_quantum
+        else:
+            self._detect_edges = self._detect_edges_classical
+        
+        # Fused JIT kernel specialised for this mode and resolution on the
+        # Numba backend; kernels are compiled here so the first timed frame
+        # does not pay for it
+        self._encode_kernel = None
+        if self._gpu:
+            self._encode_gpu(self.hbm4_buffer)
+        elif self.backend == 'numba':
+            self._encode_kernel = _get_encode_kernel(quantum_mode, width, height)
+            if self._encode_kernel is not None:
+                self._encode_kernel(self.hbm4_buffer, self._quantum_bytes(),
+                                    np.zeros(8, dtype=np.float32))
     
     def _initialize_quantum_state(self):
         """Initialize quantum state for enhanced processing"""
         # Generate quantum state from system entropy
         self.quantum_state = np.random.randint(0, 2**64, size=8, dtype=np.uint64)
     
+    @property
+    def quantum_state(self) -> np.ndarray:
+        """The 8 quantum state words (read-only; assign to replace them)"""
+        return self._quantum_state
+    
+    @quantum_state.setter
+    def quantum_state(self, state: np.ndarray):
+        state = np.array(state, dtype=np.uint64)
+        if state.shape != (8,):
+            raise ValueError(f"Expected 8 quantum state words, got shape {state.shape}")
+        state.flags.writeable = False
+        self._quantum_state = state
+        
+        # Low bytes of words 0..5 of the state rotated by each offset, so
+        # _quantum_bytes is a lookup rather than a gather per call
+        idx = (np.arange(8)[:, None] + np.arange(6)) & 7
+        self._qtable = (state[idx] & 0xFF).astype(np.int32)
+    
+    def fork(self, frame_index: int) -> 'MI350XEncoder':
+        """Create an encoder positioned frame_index frames ahead of this one
+        
+        The new encoder shares this encoder's quantum state but has its own
+        scratch buffers, so the two can encode concurrently.
+        """
+        encoder = MI350XEncoder(self.width, self.height, self.quantum_mode, self.backend)
+        encoder.quantum_state = self.quantum_state
+        if self.quantum_mode:
+            encoder._qoff = (self._qoff - frame_index) & 7
+        return encoder
+    
     def _update_quantum_state(self):
         """Update quantum state during processing"""
         if self.quantum_mode:
-            # Rotate quantum state for next iteration
-            self.quantum_state = np.roll(self.quantum_state, 1)
+            # Rotate quantum state for next iteration (same order as np.roll(state, 1))
+            self._qoff = (self._qoff - 1) & 7
+    
+    def _quantum_bytes(self) -> np.ndarray:
+        """Low bytes of the (rotated) quantum state words that drive the encoder"""
+        return self._qtable[self._qoff]
     
     def encode_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, float]:
         """Encode a frame using MI350X-optimized fractal encoding"""
-        self.stream.record()
+        if frame.shape != (self.height, self.width):
+            raise ValueError(f"Expected a {self.height}x{self.width} frame, got {frame.shape}")
         
-        # Edge detection with quantum enhancement
-        edges = self._detect_edges(frame)
-        
-        # Coordinate extraction with quantum optimization
-        coords = self._extract_coordinates(edges)
+        self.stream.record()
         
-        # Fractal transformation with quantum influence
-        coeffs = self._apply_fractal_transform(coords)
+        if self._gpu:
+            # Whole pipeline on the device; only the coefficients come back
+            coeffs = self._encode_gpu(frame)
+        elif self._encode_kernel is not None:
+            # Edge detection, coordinate extraction and fractal transform
+            # fused into a single pass over the frame
+            coeffs = np.zeros(8, dtype=np.float32)
+            self._encode_kernel(np.ascontiguousarray(frame, dtype=np.uint8),
+                                self._quantum_bytes(), coeffs)
+        else:
+            # Edge detection with quantum enhancement
+            edges = self._detect_edges(frame)
+            
+            # Coordinate extraction with quantum optimization
+            coords = self._extract_coordinates(edges)
+            
+            # Fractal transformation with quantum influence
+            coeffs = self._apply_fractal_transform(coords)
         
         # Update quantum state
         self._update_quantum_state()
@@ -78,67 +371,166 @@ class MI350XEncoder:
         latency = self.stream.synchronize()
         return coeffs, latency
     
-    def _detect_edges(self, frame: np.ndarray) -> np.ndarray:
-        """Edge detection with quantum-enhanced thresholding"""
+    def _encode_gpu(self, frame: np.ndarray) -> np.ndarray:
+        """Encode a frame on the GPU, copying back only the 8 coefficients"""
+        w, h, qm = self.width, self.height, self.quantum_mode
+        q = self._quantum_bytes()
+        if qm:
+            threshold, qgx, qgy = EDGE_THRESHOLD + int(q[0]), int(q[1]), int(q[2])
+        else:
+            threshold, qgx, qgy = EDGE_THRESHOLD, 0, 0
+        
+        # Edge detection into a device-resident 0/255 map
+        self._d_frame.set(np.ascontiguousarray(frame, dtype=np.uint8))
+        grid = ((w + 15) // 16, (h + 15) // 16)
+        _GPU_EDGE_KERNEL(grid, (16, 16),
+                         (self._d_frame, self._d_edges,
+                          np.int32(w), np.int32(h),
+                          np.int32(threshold * threshold), np.int32(qm),
+                          np.int32(qgx), np.int32(qgy)))
+        
+        # Coordinate extraction with quantum optimization
+        ys, xs = cupy.divmod(cupy.flatnonzero(self._d_edges), w)
+        if qm:
+            keep = (xs ^ ys) == int(q[3])
+            xs, ys = xs[keep], ys[keep]
+        
+        # Fractal transformation with quantum influence
+        pts = cupy.stack((xs[:4], ys[:4]), axis=1).astype(cupy.float64)
+        out = (pts @ self._d_A + self._d_t).astype(cupy.float32)
+        if qm:
+            bits = out.view(cupy.int32)
+            bits[:, 0] ^= int(q[4])
+            bits[:, 1] ^= int(q[5])
+        
+        coeffs = cupy.zeros(8, dtype=cupy.float32)
+        coeffs[:out.size] = out.ravel()
+        return cupy.asnumpy(coeffs)
+    
+    def _detect_edges_classical(self, frame: np.ndarray) -> np.ndarray:
+        """Edge detection with the classical fixed threshold
+        
+        Returns the edge map as a bit-image packed 8 pixels per byte along
+        each row (np.packbits order).
+        """
+        threshold = EDGE_THRESHOLD
+        if self._native:
+            return self._detect_edges_native(frame, threshold, 0, 0, 0)
+        
+        # Bound locally: looked up once per frame instead of once per strip
+        gradients, threshold_edges = self._gradients, self._threshold_edges
+        thr2 = threshold * threshold
+        for y0, y1 in self._strips:
+            gx, gy = gradients(frame, y0, y1)
+            threshold_edges(gx, gy, thr2, y0, y1)
+        
+        return np.packbits(self._edge_mask, axis=1)
+    
+    def _detect_edges_quantum(self, frame: np.ndarray) -> np.ndarray:
+        """Edge detection with quantum-enhanced thresholding
+        
+        Returns the edge map packed like _detect_edges_classical.
+        """
         # Apply quantum-influenced Sobel filter
+        q = self._quantum_bytes()
+        threshold = EDGE_THRESHOLD + int(q[0])
+        qgx, qgy = int(q[1]), int(q[2])
+        if self._native:
+            return self._detect_edges_native(frame, threshold, 1, qgx, qgy)
+        
+        gradients, threshold_edges = self._gradients, self._threshold_edges
+        bitwise_xor, bitwise_and = np.bitwise_xor, np.bitwise_and
+        thr2 = threshold * threshold
+        for y0, y1 in self._strips:
+            gx, gy = gradients(frame, y0, y1)
+            
+            # Quantum-enhanced gradient calculation on the uint8 difference
+            bitwise_xor(gx, qgx, out=gx)
+            bitwise_xor(gy, qgy, out=gy)
+            bitwise_and(gx, 0xFF, out=gx)
+            bitwise_and(gy, 0xFF, out=gy)
+            
+            threshold_edges(gx, gy, thr2, y0, y1)
+        
+        return np.packbits(self._edge_mask, axis=1)
+    
+    def _detect_edges_native(self, frame: np.ndarray, threshold: int,
+                             quantum: int, qgx: int, qgy: int) -> np.ndarray:
+        """Edge detection through the native SIMD kernels of libsobel.so"""
+        # AVX-512 VNNI, SVE or NEON per host CPU
+        edges = self._edge_bytes
+        if _SOBEL_EXT.sobel_u8_4k(np.ascontiguousarray(frame, dtype=np.uint8), edges,
+                                  self.width, self.height, threshold, quantum, qgx, qgy):
+            raise RuntimeError(f"sobel_u8_4k failed on a {self.height}x{self.width} frame")
+        return np.packbits(edges, axis=1)
+    
+    def _gradients(self, frame: np.ndarray, y0: int, y1: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Diagonal gradients of interior rows y0..y1-1, in the scratch buffers"""
+        # Enhanced edge detection using CDNA 4's advanced features.
+        # Gradients are taken over a whole strip at once; differences are
+        # widened to int32 so they neither wrap in uint8 nor overflow when
+        # squared.
+        gx, gy = self._gx[:y1 - y0], self._gy[:y1 - y0]
+        np.subtract(frame[y0+1:y1+1, 2:], frame[y0-1:y1-1, :-2], out=gx, dtype=np.int32)
+        np.subtract(frame[y0+1:y1+1, :-2], frame[y0-1:y1-1, 2:], out=gy, dtype=np.int32)
+        return gx, gy
+    
+    def _threshold_edges(self, gx: np.ndarray, gy: np.ndarray, thr2: int, y0: int, y1: int):
+        """Threshold a strip of gradients into rows y0..y1-1 of the edge mask"""
+        # Compare squared magnitude against squared threshold (no sqrt)
+        np.multiply(gx, gx, out=gx)
+        np.multiply(gy, gy, out=gy)
+        np.add(gx, gy, out=gx)
+        
+        # Border pixels of the mask are never written and stay False
+        np.greater(gx, thr2, out=self._edge_mask[y0:y1, 1:-1])
+    
+    def _extract_coordinates(self, edges: np.ndarray) -> np.ndarray:
+        """Extract edge coordinates from the packed edge map with quantum optimization
+        
+        Returns an (N, 2) int16 array of (x, y) rows in row-major order.
+        """
         if self.quantum_mode:
-            threshold = 30 + (self.quantum_state[0] & 0xFF)
+            # Quantum-enhanced coordinate selection: (x ^ y) == q admits
+            # exactly one pixel per row, at x = y ^ q, so only those H bits
+            # of the packed map are tested
+            ys = self._rows
+            xs = ys ^ int(self._quantum_bytes()[3])
+            inside = xs < self.width
+            ys, xs = ys[inside], xs[inside]
+            hit = (edges[ys, xs >> 3] >> (7 - (xs & 7)).astype(np.uint8)) & 1
+            ys, xs = ys[hit != 0], xs[hit != 0]
         else:
-            threshold = 30
-        
-        # Enhanced edge detection using CDNA 4's advanced features
-        edges = np.zeros_like(frame)
-        for y in range(1, self.height-1):
-            for x in range(1, self.width-1):
-                # Quantum-enhanced gradient calculation
-                if self.quantum_mode:
-                    gx = (frame[y+1,x+1] - frame[y-1,x-1]) ^ (self.quantum_state[1] & 0xFF)
-                    gy = (frame[y+1,x-1] - frame[y-1,x+1]) ^ (self.quantum_state[2] & 0xFF)
-                else:
-                    gx = frame[y+1,x+1] - frame[y-1,x-1]
-                    gy = frame[y+1,x-1] - frame[y-1,x+1]
-                
-                magnitude = np.sqrt(gx*gx + gy*gy)
-                edges[y,x] = 255 if magnitude > threshold else 0
-        
-        return edges
-    
-    def _extract_coordinates(self, edges: np.ndarray) -> List[Tuple[int, int]]:
-        """Extract edge coordinates with quantum optimization"""
-        coords = []
-        for y in range(self.height):
-            for x in range(self.width):
-                if edges[y,x] == 255:
-                    # Quantum-enhanced coordinate selection
-                    if self.quantum_mode:
-                        if (x ^ y) == (self.quantum_state[3] & 0xFF):
-                            coords.append((x, y))
-                    else:
-                        coords.append((x, y))
+            # Scan the packed map for non-empty bytes, 8 pixels per byte;
+            # each non-empty byte yields at least one coordinate
+            packed = edges.ravel()
+            hit_bytes = np.flatnonzero(packed)[:64]
+            
+            # Unpack only the non-empty bytes into row-major pixel indices
+            byte_idx, bit = np.nonzero(np.unpackbits(packed[hit_bytes][:, None], axis=1))
+            hits = (hit_bytes[byte_idx] * 8 + bit)[:64]
+            ys, xs = np.divmod(hits, edges.shape[1] * 8)
         
+        coords = np.empty((xs.size, 2), dtype=np.int16)
+        coords[:, 0] = xs
+        coords[:, 1] = ys
         return coords[:64]  # Limit to 64 coordinates for fractal transform
     
-    def _apply_fractal_transform(self, coords: List[Tuple[int, int]]) -> np.ndarray:
+    def _apply_fractal_transform(self, coords: np.ndarray) -> np.ndarray:
         """Apply fractal transformation with quantum influence"""
-        # Affine transformation parameters
-        a, b, c, d = 0.85, 0.04, -0.04, 0.85
-        e, f = 0.0, 1.6
+        # Map the first 4 (x, y) coordinates in one matmul, [x y] @ A + t,
+        # and round once to the float32 output coefficients
+        pts = coords[:4].astype(np.float64)
+        out = (pts @ self._A + self._t).astype(np.float32)
         
-        # Initialize result array
-        result = np.zeros(8, dtype=np.float32)
+        if self.quantum_mode:
+            # Apply quantum influence to the float32 bit pattern
+            bits = out.view(np.int32)
+            qmask = self._quantum_bytes()[4:6]
+            np.bitwise_xor(bits, qmask, out=bits)
         
-        # Process coordinates with quantum enhancement
-        for i, (x, y) in enumerate(coords[:4]):  # Process first 4 coordinates
-            if self.quantum_mode:
-                # Apply quantum-influenced transformation
-                qx = (a * x + b * y + e) ^ (self.quantum_state[4] & 0xFF)
-                qy = (c * x + d * y + f) ^ (self.quantum_state[5] & 0xFF)
-                result[i*2] = qx
-                result[i*2+1] = qy
-            else:
-                # Classical transformation
-                result[i*2] = a * x + b * y + e
-                result[i*2+1] = c * x + d * y + f
+        result = np.zeros(8, dtype=np.float32)
+        result[:out.size] = out.ravel()
         
         return result
 
@@ -148,19 +540,19 @@ class XilinxFPGAEncoder:
     def __init__(self, width: int, height: int):
         self.width = width
         self.height = height
+        
+        # Dummy coefficients returned for every frame, allocated once
+        self._dummy = np.zeros(8, dtype=np.float32)
     
     def encode_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, float]:
         """Encode a frame using FPGA-based fractal encoding"""
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         # Simulate FPGA processing delay
         time.sleep(0.001)  # 1ms baseline latency
         
-        # Generate dummy coefficients
-        coeffs = np.random.rand(8).astype(np.float32)
-        
-        latency = time.time() - start_time
-        return coeffs, latency
+        latency = (time.perf_counter_ns() - start_time) * 1e-9
+        return self._dummy, latency
 
 class H266Encoder:
     """H.266/VVC encoder for comparison"""
@@ -168,68 +560,133 @@ class H266Encoder:
     def __init__(self, width: int, height: int):
         self.width = width
         self.height = height
+        
+        # Dummy coefficients returned for every frame, allocated once
+        self._dummy = np.zeros(8, dtype=np.float32)
     
     def encode_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, float]:
         """Encode a frame using H.266"""
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         # Simulate H.266 encoding delay
         time.sleep(0.005)  # 5ms baseline latency
         
-        # Generate dummy coefficients
-        coeffs = np.random.rand(8).astype(np.float32)
-        
-        latency = time.time() - start_time
-        return coeffs, latency
+        latency = (time.perf_counter_ns() - start_time) * 1e-9
+        return self._dummy, latency
+
+def _refill_frame(rng: np.random.Generator, frame: np.ndarray):
+    """Overwrite a reusable frame buffer with fresh random content"""
+    frame[...] = rng.integers(0, 256, size=frame.shape, dtype=np.uint8)
+
+def _encode_parallel(encoder: MI350XEncoder, frame_ring: np.ndarray, rngs: list,
+                     latencies: np.ndarray, workers: int):
+    """Encode len(latencies) frames on worker threads, recording each latency
+    
+    Frames are split into contiguous chunks, one per worker. Each worker
+    runs a fork of the encoder positioned at the start of its chunk, so the
+    quantum state rotates exactly as in a sequential run, and streams its
+    frames through its own slot of frame_ring using its own generator.
+    """
+    bounds = np.linspace(0, len(latencies), workers + 1).astype(int)
+    encoders = [encoder] + [encoder.fork(start) for start in bounds[1:-1]]
+    
+    def run_chunk(k):
+        for i in range(bounds[k], bounds[k+1]):
+            _refill_frame(rngs[k], frame_ring[k])
+            _, latencies[i] = encoders[k].encode_frame(frame_ring[k])
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(run_chunk, range(workers)))
 
 def run_latency_test(
     width: int = 1920,
     height: int = 1080,
     num_frames: int = 100,
-    quantum_mode: bool = False
+    quantum_mode: bool = False,
+    workers: int = 1,
+    backend: str = None
 ) -> Dict:
-    """Run latency test comparing different encoders"""
+    """Run latency test comparing different encoders
+    
+    With workers > 1 the MI350X frames are encoded concurrently on that many
+    threads before the sequential FPGA/H.266 runs. This shortens the
+    benchmark, but concurrent frames compete for cores and memory bandwidth.
+    backend selects the MI350X encoder backend (see BACKENDS); by default
+    MI350X_BACKEND or the first available of AUTO_BACKENDS is used.
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
     
     # Initialize encoders
-    mi350x = MI350XEncoder(width, height, quantum_mode)
+    mi350x = MI350XEncoder(width, height, quantum_mode, backend)
     fpga = XilinxFPGAEncoder(width, height)
     h266 = H266Encoder(width, height)
     
-    # Test results
+    # Numba's workqueue threading layer cannot run kernels from several
+    # threads at once
+    if (workers > 1 and mi350x._encode_kernel is not None
+            and threading_layer() == 'workqueue'):
+        print("Numba workqueue threading layer is not thread-safe; using 1 worker")
+        workers = 1
+    
+    # Test results; latencies go into preallocated per-encoder buffers
     results = {
-        'mi350x': {'latencies': [], 'quantum_mode': quantum_mode},
-        'fpga': {'latencies': []},
-        'h266': {'latencies': []}
+        'mi350x': {'latencies': np.empty(num_frames), 'quantum_mode': quantum_mode,
+                   'workers': workers, 'backend': mi350x.backend},
+        'fpga': {'latencies': np.empty(num_frames)},
+        'h266': {'latencies': np.empty(num_frames)}
     }
     
-    # Generate test frames
-    frames = [np.random.randint(0, 256, (height, width), dtype=np.uint8) 
-             for _ in range(num_frames)]
+    if mi350x.backend == 'native':
+        results['mi350x']['isa'] = _SOBEL_EXT.sobel_isa().decode()
+    
+    # Stream test frames through a ring of reusable buffers, one slot and
+    # one independent generator per worker, refilled before every frame;
+    # memory stays flat in num_frames
+    rngs = [np.random.default_rng(seed) for seed in np.random.SeedSequence().spawn(workers)]
+    frame_ring = np.empty((workers, height, width), dtype=np.uint8)
     
     # Run tests
-    for i, frame in enumerate(frames):
+    if workers > 1:
+        # MI350X frames are independent, so encode them all concurrently
+        _encode_parallel(mi350x, frame_ring, rngs, results['mi350x']['latencies'], workers)
+    
+    frame = frame_ring[0]
+    for i in range(num_frames):
         print(f"Processing frame {i+1}/{num_frames}")
+        _refill_frame(rngs[0], frame)
         
         # MI350X encoding
-        coeffs, latency = mi350x.encode_frame(frame)
-        results['mi350x']['latencies'].append(latency)
+        if workers == 1:
+            coeffs, latency = mi350x.encode_frame(frame)
+            results['mi350x']['latencies'][i] = latency
         
         # FPGA encoding
         coeffs, latency = fpga.encode_frame(frame)
-        results['fpga']['latencies'].append(latency)
+        results['fpga']['latencies'][i] = latency
         
         # H.266 encoding
         coeffs, latency = h266.encode_frame(frame)
-        results['h266']['latencies'].append(latency)
+        results['h266']['latencies'][i] = latency
     
     # Calculate statistics
     for encoder in results:
         latencies = results[encoder]['latencies']
+        # p95/p99 by selection rather than a full sort, at nearest rank:
+        # the ceil(p * N / 100)-th smallest latency, as with
+        # np.percentile(..., method='inverted_cdf')
+        n = len(latencies)
+        kth = [min(max((p * n + 99) // 100 - 1, 0), n - 1) for p in (95, 99)]
+        part = np.partition(latencies, kth)
+        p95, p99 = part[kth[0]], part[kth[1]]
         results[encoder].update({
-            'mean_latency': np.mean(latencies),
-            'std_latency': np.std(latencies),
-            'min_latency': np.min(latencies),
-            'max_latency': np.max(latencies)
+            'latencies': latencies.tolist(),
+            'mean_latency': latencies.mean(),
+            'std_latency': latencies.std(),
+            'min_latency': latencies.min(),
+            'max_latency': latencies.max(),
+            'p95_latency': p95,
+            'p99_latency': p99
         })
     
     return results
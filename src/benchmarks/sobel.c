@@ -0,0 +1,94 @@
+/*
+ * Entry point of the native edge-detection extension (libsobel.so).
+ *
+ * Loaded by latency_test.py through ctypes; the best kernel for the host
+ * CPU is picked once when the library is loaded, with a portable scalar
+ * loop as the fallback.
+ */
+#include <string.h>
+
+#if defined(__aarch64__)
+#include <sys/auxv.h>
+#ifndef HWCAP_SVE
+#define HWCAP_SVE (1 << 22)
+#endif
+#endif
+
+#include "sobel.h"
+
+typedef void (*sobel_row_fn)(const uint8_t *, const uint8_t *, uint8_t *, int,
+                             int, int, int, int);
+
+static void sobel_row_portable(const uint8_t *up, const uint8_t *dn, uint8_t *out, int w,
+                               int thr2, int quantum, int qgx, int qgy)
+{
+    sobel_row_scalar(up, dn, out, 1, w - 1, thr2, quantum, qgx, qgy);
+}
+
+static sobel_row_fn select_row_kernel(const char **isa)
+{
+#if defined(__x86_64__) || defined(__i386__)
+    if (sobel_avx512_supported()) {
+        *isa = "avx512-vnni";
+        return sobel_row_avx512;
+    }
+#endif
+#if defined(__aarch64__)
+#if defined(SOBEL_HAVE_SVE)
+    if (getauxval(AT_HWCAP) & HWCAP_SVE) {
+        *isa = "sve";
+        return sobel_row_sve;
+    }
+#endif
+    /* Advanced SIMD is mandatory on AArch64 */
+    *isa = "neon";
+    return sobel_row_neon;
+#endif
+    *isa = "scalar";
+    return sobel_row_portable;
+}
+
+/* Row kernel and its ISA name, resolved at load time */
+static sobel_row_fn row_kernel = sobel_row_portable;
+static const char *row_isa = "scalar";
+
+__attribute__((constructor))
+static void sobel_init(void)
+{
+    row_kernel = select_row_kernel(&row_isa);
+}
+
+const char *sobel_isa(void)
+{
+    return row_isa;
+}
+
+/*
+ * Write the 0/255 edge map of the w x h uint8 frame src into dst.
+ * Border pixels are always 0. Returns 0 on success.
+ */
+int sobel_u8_4k(const uint8_t *src, uint8_t *dst, int w, int h, int thr,
+                int quantum, int qgx, int qgy)
+{
+    const sobel_row_fn row = row_kernel;
+    const int thr2 = thr * thr;
+
+    if (w < 0 || h < 0)
+        return -1;
+    if (w < 3 || h < 3) {
+        memset(dst, 0, (size_t)w * h);
+        return 0;
+    }
+    memset(dst, 0, (size_t)w);
+    memset(dst + (size_t)(h - 1) * w, 0, (size_t)w);
+
+#pragma omp parallel for schedule(static)
+    for (int y = 1; y < h - 1; y++) {
+        uint8_t *out = dst + (size_t)y * w;
+        out[0] = 0;
+        out[w - 1] = 0;
+        row(src + (size_t)(y - 1) * w, src + (size_t)(y + 1) * w, out, w,
+            thr2, quantum, qgx, qgy);
+    }
+    return 0;
+}
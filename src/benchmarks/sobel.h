@@ -0,0 +1,48 @@
+/*
+ * Native edge-detection kernels for the MI350X fractal encoder benchmark.
+ *
+ * Every kernel computes the same diagonal gradient as
+ * MI350XEncoder._detect_edges in latency_test.py:
+ *
+ *   gx = src[y+1][x+1] - src[y-1][x-1]
+ *   gy = src[y+1][x-1] - src[y-1][x+1]
+ *
+ * In quantum mode each difference is reduced to its low byte and XORed
+ * with a byte of the quantum state. A pixel is an edge (255) when
+ * gx*gx + gy*gy > thr*thr and 0 otherwise.
+ */
+#ifndef SOBEL_H
+#define SOBEL_H
+
+#include <stdint.h>
+
+/* Process interior pixels [x0, x1) of one output row. up/dn point to rows y-1/y+1. */
+static inline void sobel_row_scalar(const uint8_t *up, const uint8_t *dn, uint8_t *out,
+                                    int x0, int x1, int thr2,
+                                    int quantum, int qgx, int qgy)
+{
+    for (int x = x0; x < x1; x++) {
+        int gx = dn[x + 1] - up[x - 1];
+        int gy = dn[x - 1] - up[x + 1];
+        if (quantum) {
+            gx = (gx & 0xFF) ^ qgx;
+            gy = (gy & 0xFF) ^ qgy;
+        }
+        out[x] = gx * gx + gy * gy > thr2 ? 255 : 0;
+    }
+}
+
+#if defined(__x86_64__) || defined(__i386__)
+int sobel_avx512_supported(void);
+void sobel_row_avx512(const uint8_t *up, const uint8_t *dn, uint8_t *out, int w,
+                      int thr2, int quantum, int qgx, int qgy);
+#endif
+
+#if defined(__aarch64__)
+void sobel_row_neon(const uint8_t *up, const uint8_t *dn, uint8_t *out, int w,
+                    int thr2, int quantum, int qgx, int qgy);
+void sobel_row_sve(const uint8_t *up, const uint8_t *dn, uint8_t *out, int w,
+                   int thr2, int quantum, int qgx, int qgy);
+#endif
+
+#endif /* SOBEL_H */
@@ -0,0 +1,71 @@
+/*
+ * AVX-512 VNNI row kernel.
+ *
+ * 64 pixels per step: the four shifted source vectors are loaded once,
+ * widened 16 lanes at a time to int32 and the (gx, gy) pair of each pixel
+ * is packed into one dword so a single VPDPWSSD yields gx*gx + gy*gy.
+ * The 4x16 compare masks form one 64-bit mask that is stored as 0/255.
+ */
+#include "sobel.h"
+
+#if defined(__x86_64__) || defined(__i386__)
+#include <immintrin.h>
+
+int sobel_avx512_supported(void)
+{
+    __builtin_cpu_init();
+    return __builtin_cpu_supports("avx512f") &&
+           __builtin_cpu_supports("avx512bw") &&
+           __builtin_cpu_supports("avx512vnni");
+}
+
+__attribute__((target("avx512f,avx512bw,avx512vnni")))
+void sobel_row_avx512(const uint8_t *up, const uint8_t *dn, uint8_t *out, int w,
+                      int thr2, int quantum, int qgx, int qgy)
+{
+    const __m512i vthr2 = _mm512_set1_epi32(thr2);
+    const __m512i vbyte = _mm512_set1_epi32(0xFF);
+    const __m512i vword = _mm512_set1_epi32(0xFFFF);
+    const __m512i vqgx = _mm512_set1_epi32(qgx);
+    const __m512i vqgy = _mm512_set1_epi32(qgy);
+    int x = 1;
+
+    for (; x + 64 <= w - 1; x += 64) {
+        const __m512i dn_r = _mm512_loadu_si512((const void *)(dn + x + 1));
+        const __m512i up_l = _mm512_loadu_si512((const void *)(up + x - 1));
+        const __m512i dn_l = _mm512_loadu_si512((const void *)(dn + x - 1));
+        const __m512i up_r = _mm512_loadu_si512((const void *)(up + x + 1));
+        __mmask64 edge = 0;
+
+#define SOBEL_LANE(k)                                                              \
+        do {                                                                       \
+            __m512i gx = _mm512_sub_epi32(                                         \
+                _mm512_cvtepu8_epi32(_mm512_extracti32x4_epi32(dn_r, k)),          \
+                _mm512_cvtepu8_epi32(_mm512_extracti32x4_epi32(up_l, k)));         \
+            __m512i gy = _mm512_sub_epi32(                                         \
+                _mm512_cvtepu8_epi32(_mm512_extracti32x4_epi32(dn_l, k)),          \
+                _mm512_cvtepu8_epi32(_mm512_extracti32x4_epi32(up_r, k)));         \
+            if (quantum) {                                                         \
+                gx = _mm512_xor_si512(_mm512_and_si512(gx, vbyte), vqgx);          \
+                gy = _mm512_xor_si512(_mm512_and_si512(gy, vbyte), vqgy);          \
+            }                                                                      \
+            /* |gx|, |gy| <= 255, so both fit the int16 halves of one dword */     \
+            __m512i pair = _mm512_or_si512(_mm512_and_si512(gx, vword),            \
+                                           _mm512_slli_epi32(gy, 16));             \
+            __m512i mag2 = _mm512_dpwssd_epi32(_mm512_setzero_si512(), pair, pair); \
+            edge |= (__mmask64)_mm512_cmpgt_epi32_mask(mag2, vthr2) << (16 * (k)); \
+        } while (0)
+
+        SOBEL_LANE(0);
+        SOBEL_LANE(1);
+        SOBEL_LANE(2);
+        SOBEL_LANE(3);
+#undef SOBEL_LANE
+
+        _mm512_storeu_si512((void *)(out + x), _mm512_maskz_set1_epi8(edge, (char)0xFF));
+    }
+
+    sobel_row_scalar(up, dn, out, x, w - 1, thr2, quantum, qgx, qgy);
+}
+
+#endif
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Consistency tests for the MI350X encoder backends in latency_test.py
+"""
+
+import numpy as np
+import pytest
+
+import latency_test as lt
+
+# Odd frame sizes: widths that are not a multiple of 8 and that leave a
+# tail after the 64-pixel AVX-512 blocks, plus a frame smaller than a block
+SIZES = [(67, 41), (131, 53), (200, 37), (13, 9)]
+
+def _reference_encode(frame: np.ndarray, quantum_mode: bool, q: np.ndarray):
+    """Scalar reference for one encoded frame: (edge mask, coefficients)"""
+    h, w = frame.shape
+    threshold = lt.EDGE_THRESHOLD + int(q[0]) if quantum_mode else lt.EDGE_THRESHOLD
+    
+    mask = np.zeros((h, w), dtype=bool)
+    coords = []
+    for y in range(1, h - 1):
+        for x in range(1, w - 1):
+            gx = int(frame[y+1, x+1]) - int(frame[y-1, x-1])
+            gy = int(frame[y+1, x-1]) - int(frame[y-1, x+1])
+            if quantum_mode:
+                gx = (gx & 0xFF) ^ int(q[1])
+                gy = (gy & 0xFF) ^ int(q[2])
+            mask[y, x] = gx * gx + gy * gy > threshold * threshold
+            if mask[y, x] and (not quantum_mode or (x ^ y) == int(q[3])):
+                coords.append((x, y))
+    
+    a, b, c, d, e, f = lt.AFFINE_PARAMS
+    coeffs = np.zeros(8, dtype=np.float32)
+    bits = coeffs.view(np.int32)
+    for i, (x, y) in enumerate(coords[:4]):
+        coeffs[i*2] = a * x + b * y + e
+        coeffs[i*2+1] = c * x + d * y + f
+        if quantum_mode:
+            bits[i*2] ^= int(q[4])
+            bits[i*2+1] ^= int(q[5])
+    return mask, coeffs
+
+def _make_encoder(width: int, height: int, quantum_mode: bool, backend: str):
+    if not lt._backend_available(backend):
+        pytest.skip(f"{backend} backend is not available")
+    encoder = lt.MI350XEncoder(width, height, quantum_mode, backend)
+    encoder.quantum_state = np.random.default_rng(7).integers(
+        0, 2**64, size=8, dtype=np.uint64)
+    return encoder
+
+def _frames(width: int, height: int, count: int):
+    # Low-contrast noise, alternating with flat frames that carry a few
+    # isolated spikes so that edges also land in the row tails
+    rng = np.random.default_rng(width * height)
+    frames = []
+    for k in range(count):
+        if k % 2:
+            frame = np.where(rng.random((height, width)) < 0.01, 255, 16).astype(np.uint8)
+        else:
+            frame = rng.integers(0, 48, size=(height, width), dtype=np.uint8)
+        frames.append(frame)
+    return frames
+
+@pytest.mark.parametrize('backend', ['numpy', 'native', 'numba'])
+@pytest.mark.parametrize('quantum_mode', [False, True])
+@pytest.mark.parametrize('width,height', SIZES)
+def test_backend_matches_reference(width, height, quantum_mode, backend):
+    encoder = _make_encoder(width, height, quantum_mode, backend)
+    for frame in _frames(width, height, 4):
+        q = encoder._quantum_bytes().copy()
+        mask, expected = _reference_encode(frame, quantum_mode, q)
+        
+        if backend != 'numba':
+            # The fused kernel never materialises an edge map
+            edges = encoder._detect_edges(frame)
+            np.testing.assert_array_equal(
+                np.unpackbits(edges, axis=1, count=width).astype(bool), mask)
+        
+        coeffs, _ = encoder.encode_frame(frame)
+        np.testing.assert_array_equal(coeffs.view(np.int32), expected.view(np.int32))
+
+def test_rotation_matches_np_roll():
+    encoder = _make_encoder(16, 16, True, 'numpy')
+    state = encoder.quantum_state.copy()
+    frame = np.zeros((16, 16), dtype=np.uint8)
+    for k in range(12):
+        expected = (np.roll(state, k)[:6] & 0xFF).astype(np.int32)
+        np.testing.assert_array_equal(encoder._quantum_bytes(), expected)
+        encoder.encode_frame(frame)
+
+def test_quantum_state_assignment_drives_encoding():
+    encoder = _make_encoder(16, 16, True, 'numpy')
+    encoder.quantum_state = np.arange(8, dtype=np.uint64) + 0x100
+    np.testing.assert_array_equal(encoder._quantum_bytes(), np.arange(6))
+
+@pytest.mark.parametrize('backend', ['numpy', 'numba'])
+def test_fork_matches_sequential_run(backend):
+    width, height = 67, 41
+    frames = _frames(width, height, 10)
+    encoder = _make_encoder(width, height, True, backend)
+    forks = [encoder.fork(k) for k in range(len(frames))]
+    sequential = [encoder.encode_frame(frame)[0] for frame in frames]
+    for k, (frame, expected) in enumerate(zip(frames, sequential)):
+        coeffs, _ = forks[k].encode_frame(frame)
+        np.testing.assert_array_equal(coeffs.view(np.int32), expected.view(np.int32))
+
+def test_run_latency_test_rejects_no_workers():
+    with pytest.raises(ValueError):
+        lt.run_latency_test(16, 16, 1, workers=0)
+
+def test_percentiles_are_nearest_rank():
+    results = lt.run_latency_test(16, 16, 100)
+    for encoder in results.values():
+        latencies = np.array(encoder['latencies'])
+        assert encoder['p95_latency'] == np.percentile(latencies, 95, method='inverted_cdf')
+        assert encoder['p99_latency'] == np.percentile(latencies, 99, method='inverted_cdf')